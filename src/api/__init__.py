@@ -1,5 +1,6 @@
 import os
 
+from brotli_asgi import BrotliMiddleware
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -23,6 +24,14 @@ def create_app():
         allow_headers=["*"],
     )
 
+    # Negotiates br, falling back to gzip for clients that only accept gzip.
+    # PDF reports are already compressed internally, so skip them.
+    app.add_middleware(
+        BrotliMiddleware,
+        minimum_size=1000,
+        excluded_handlers=["^/api/pdf_generator"],
+    )
+
     app.include_router(api_router, prefix="/api")
 
     @app.get("/")
@@ -1,14 +1,16 @@
 import csv
 import time
 from io import BytesIO
+from typing import List, Literal, Optional, get_args
 
 from fastapi import APIRouter, HTTPException, Response
+from fastapi.responses import ORJSONResponse
 from google.api_core import exceptions
 from google.api_core.client_options import ClientOptions
 from google.api_core.exceptions import ResourceExhausted
 from google.cloud import discoveryengine_v1 as discoveryengine
 from grpc import StatusCode
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, field_validator, model_validator
 
 from ..config import Config
 from ..utils.pdf_generator import generate_pdf
@@ -23,8 +25,26 @@ class AiSearchRequest(BaseModel):
     query: str = None
 
 
+BatchField = Literal[
+    "category", "subcategory", "preamble", "query", "answer", "references", "status"
+]
+
+
 class BatchAiSearchRequest(BaseModel):
     argument: str
+    compact: bool = False
+    fields: Optional[List[BatchField]] = Field(None, min_length=1)
+
+    @field_validator("fields")
+    @classmethod
+    def _dedupe_fields(cls, fields):
+        return None if fields is None else list(dict.fromkeys(fields))
+
+    @model_validator(mode="after")
+    def _fields_require_compact(self):
+        if self.fields is not None and not self.compact:
+            raise ValueError("fields can only be selected with compact set")
+        return self
 
 
 PdfGeneratorRouter = APIRouter()
@@ -36,7 +56,7 @@ BatchAiSearchRouter = APIRouter()
 def pdf_generator(request: PdfGeneratorRequest):
     """Generate a PDF based on the provided argument."""
     argument = request.argument
-    batch_results = batch_ai_search(BatchAiSearchRequest(argument=argument))
+    batch_results = _run_batch_ai_search(argument)
     pdf_content = generate_pdf(batch_results)
     return Response(
         content=pdf_content,
@@ -144,10 +164,21 @@ def _format_search_result(search_results):
     }
 
 
-@BatchAiSearchRouter.post("/")
+@BatchAiSearchRouter.post("/", response_class=ORJSONResponse)
 def batch_ai_search(request: BatchAiSearchRequest):
-    """Perform a batch AI search."""
-    argument = request.argument
+    """Perform a batch AI search.
+
+    With ``compact`` set, only the requested ``fields`` are returned and
+    repeated preambles and references are deduplicated into shared tables.
+    """
+    batch_results = _run_batch_ai_search(request.argument)
+    if request.compact:
+        batch_results = _compact_batch_results(batch_results, request.fields)
+    return batch_results
+
+
+def _run_batch_ai_search(argument):
+    """Run every predefined query for the argument and collect the results."""
     predefined_queries = _get_predefined_queries(argument)
 
     tasks = []
@@ -173,6 +204,55 @@ def batch_ai_search(request: BatchAiSearchRequest):
     return {"original_input": argument, "results": results}
 
 
+def _compact_batch_results(batch_results, fields=None):
+    """Reduce batch results to the selected fields with deduplicated tables."""
+    if fields is None:
+        fields = list(get_args(BatchField))
+    preambles, preamble_index = [], {}
+    references, reference_index = [], {}
+
+    def _intern(table, index, key, value):
+        if key not in index:
+            index[key] = len(table)
+            table.append(value)
+        return index[key]
+
+    rows = []
+    for result in batch_results["results"]:
+        response = result["response"] or {}
+        row = {}
+        for field in fields:
+            if field == "preamble":
+                row["preamble"] = _intern(
+                    preambles, preamble_index, result["preamble"], result["preamble"]
+                )
+            elif field == "answer":
+                row["answer"] = response.get("Answer")
+            elif field == "status":
+                row["status"] = response.get("Status")
+            elif field == "references":
+                row["references"] = [
+                    _intern(
+                        references,
+                        reference_index,
+                        (reference["Title"], reference["Document"]),
+                        reference,
+                    )
+                    for reference in response.get("References", [])
+                ]
+            else:
+                row[field] = result[field]
+        rows.append(row)
+
+    compact = {"original_input": batch_results["original_input"], "fields": fields}
+    if "preamble" in fields:
+        compact["preambles"] = preambles
+    if "references" in fields:
+        compact["references"] = references
+    compact["results"] = rows
+    return compact
+
+
 def _get_predefined_queries(argument):
     """Retrieve predefined queries based on the provided argument."""
     matched_queries = []
@@ -1,13 +1,204 @@
 import base64
+import itertools
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
 import streamlit as st
 import streamlit.components.v1 as components
+from requests.adapters import HTTPAdapter
 
 api_service_url = os.getenv("API_SERVICE_URL")
 GOOGLE_CLOUD_PROJECT = os.getenv("GOOGLE_CLOUD_PROJECT")
 AI_CHAT_AGENT_ID = os.getenv("AI_CHAT_AGENT_ID")
+API_CONNECT_TIMEOUT = float(os.getenv("API_CONNECT_TIMEOUT", 5))
+API_READ_TIMEOUT = float(os.getenv("API_READ_TIMEOUT", 900))
+API_WORKER_THREADS = int(os.getenv("API_WORKER_THREADS", 8))
+PDF_WORKER_THREADS = int(os.getenv("PDF_WORKER_THREADS", 2))
+PDF_CACHE_SIZE = int(os.getenv("PDF_CACHE_SIZE", 32))
+PDF_CACHE_TTL = float(os.getenv("PDF_CACHE_TTL", 3600))
+POLL_INTERVAL = 2
+
+
+class ApiJobs:
+    """Run API calls in background threads shared by every user session.
+
+    Worker threads only run plain Python and never call Streamlit APIs.
+    PDF reports get their own pool so they cannot starve the short calls,
+    and concurrent requests for the same ingredient share one report.
+    """
+
+    def __init__(self):
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=API_WORKER_THREADS + PDF_WORKER_THREADS)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._pool = ThreadPoolExecutor(max_workers=API_WORKER_THREADS)
+        self._pdf_pool = ThreadPoolExecutor(max_workers=PDF_WORKER_THREADS)
+        self._lock = threading.Lock()
+        self._report_ids = itertools.count()
+        self._pdf_jobs = {}
+
+    def post(self, endpoint, payload):
+        """POST to an API endpoint, raising on connection errors or bad status."""
+        response = self._session.post(
+            f"{api_service_url}/api/{endpoint}/",
+            json=payload,
+            timeout=(API_CONNECT_TIMEOUT, API_READ_TIMEOUT),
+        )
+        response.raise_for_status()
+        return response
+
+    def submit(self, endpoint, payload):
+        """Run a short API call in the background."""
+        return self._pool.submit(self.post, endpoint, payload)
+
+    def submit_pdf(self, argument):
+        """Start a new PDF report, joining the one in flight if there is one.
+
+        Returns the report id and its future, which resolves to the PDF
+        encoded as base64.
+        """
+        with self._lock:
+            job = self._pdf_jobs.get(argument)
+            if job is None or job[1].done():
+                future = self._pdf_pool.submit(self._generate_pdf, argument)
+                job = (next(self._report_ids), future)
+                self._pdf_jobs[argument] = job
+            return job
+
+    def take_pdf(self, argument, report_id):
+        """Hand over a finished report and forget its job, or return None."""
+        with self._lock:
+            job = self._pdf_jobs.get(argument)
+            if job is None or job[0] != report_id or not job[1].done():
+                return None
+            del self._pdf_jobs[argument]
+        return job[1].result()
+
+    def _generate_pdf(self, argument):
+        response = self.post("pdf_generator", {"argument": argument})
+        return base64.b64encode(response.content).decode()
+
+
+@st.cache_resource
+def get_api_jobs():
+    return ApiJobs()
+
+
+@st.cache_resource(ttl=PDF_CACHE_TTL, max_entries=PDF_CACHE_SIZE, show_spinner=False)
+def load_pdf(argument, report_id):
+    """Return a finished report, shared as one object by every session."""
+    return get_api_jobs().take_pdf(argument, report_id)
+
+
+def track_job(key, label, future, report_id=None):
+    st.session_state["jobs"][key] = {
+        "label": label,
+        "future": future,
+        "report_id": report_id,
+        "started": None,
+    }
+
+
+def pdf_to_show(argument):
+    if not argument.strip() or argument not in st.session_state["pdf_ready"]:
+        return None
+    return argument
+
+
+@st.fragment
+def show_controls():
+    """Inputs and buttons, rerun on their own so the PDF is not resent."""
+    argument = st.text_input(
+        "Enter food ingredient",
+        key="ingredient_input",
+        placeholder="e.g., pork, chicken breast, pineapple, avocado",
+        help="Enter a food ingredient to search for",
+    )
+    # Only rerun the whole page when the PDF shown has to change
+    if pdf_to_show(argument) != st.session_state.get("shown_pdf"):
+        st.rerun()
+
+    jobs = st.session_state["jobs"]
+    api_jobs = get_api_jobs()
+    missing_argument = not argument.strip()
+
+    # Button for WebPdfSearch
+    if st.button(
+        "Start WebPdfSearch",
+        key="webpdfsearch_button",
+        help="Click to initiate the WebPdfSearch process.",
+        disabled=missing_argument or ("web_pdf_search", argument) in jobs,
+    ):
+        track_job(
+            ("web_pdf_search", argument),
+            f"WebPdfSearch for {argument}",
+            api_jobs.submit("web_pdf_search", {"argument": argument}),
+        )
+        st.rerun()
+
+    # Button for ImportDocuments
+    if st.button(
+        "Start ImportDocuments",
+        key="importdocuments_button",
+        help="Click to initiate the ImportDocuments process.",
+        disabled=("import_documents",) in jobs,
+    ):
+        track_job(
+            ("import_documents",),
+            "ImportDocuments",
+            api_jobs.submit("import_documents", {"location": "global"}),
+        )
+        st.rerun()
+
+    # Button for PdfGenerator
+    if st.button(
+        "Start PdfGenerator",
+        key="pdfgenerator_button",
+        help="Click to initiate the PdfGenerator process.",
+        disabled=missing_argument or ("pdf_generator", argument) in jobs,
+    ):
+        report_id, future = api_jobs.submit_pdf(argument)
+        track_job(
+            ("pdf_generator", argument),
+            f"PdfGenerator for {argument}",
+            future,
+            report_id,
+        )
+        st.rerun()
+
+
+@st.fragment(run_every=POLL_INTERVAL)
+def show_job_progress():
+    """Poll running jobs and report each one once it has finished."""
+    jobs = st.session_state["jobs"]
+    finished = [key for key, job in jobs.items() if job["future"].done()]
+    for key in finished:
+        job = jobs.pop(key)
+        if job["future"].exception() is None:
+            st.session_state["notices"].append(
+                ("success", f"{job['label']} completed successfully")
+            )
+            if key[0] == "pdf_generator":
+                load_pdf(key[1], job["report_id"])
+                st.session_state["pdf_ready"][key[1]] = job["report_id"]
+        else:
+            st.session_state["notices"].append(("error", f"{job['label']} failed"))
+    if finished:
+        st.rerun()
+
+    for job in jobs.values():
+        if not job["future"].running():
+            st.status(f"{job['label']} queued...", state="running")
+            continue
+        # Time from when the job was first seen running, not when queued
+        if job["started"] is None:
+            job["started"] = time.monotonic()
+        elapsed = int(time.monotonic() - job["started"])
+        st.status(f"{job['label']} running... ({elapsed}s)", state="running")
 
 
 st.set_page_config(page_title="🥑🔍 Food Ingredient Search 🤖", page_icon=":mag:")
@@ -16,65 +207,38 @@ st.write(
     "Discover valuable insights about food ingredients using our AI-powered search engine."
 )
 
+st.session_state.setdefault("jobs", {})
+st.session_state.setdefault("notices", [])
+st.session_state.setdefault("pdf_ready", {})
+
+# Look up the PDF for the current ingredient in the shared cache
+argument = st.session_state.get("ingredient_input", "")
+pdf_base64 = None
+if pdf_to_show(argument) is not None:
+    pdf_base64 = load_pdf(argument, st.session_state["pdf_ready"][argument])
+    if pdf_base64 is None:
+        del st.session_state["pdf_ready"][argument]
+st.session_state["shown_pdf"] = argument if pdf_base64 is not None else None
+
 st.subheader("Search Parameters")
-argument = st.text_input(
-    "Enter food ingredient",
-    key="ingredient_input",
-    placeholder="e.g., pork, chicken breast, pineapple, avocado",
-    help="Enter a food ingredient to search for",
-)
-if (
-    "last_argument" not in st.session_state
-    or st.session_state["last_argument"] != argument
-):
-    st.session_state["pdf_base64"] = None
-    st.session_state["last_argument"] = argument
-
-# Button for WebPdfSearch
-if st.button(
-    "Start WebPdfSearch", key="webpdfsearch_button", help="Click to initiate the WebPdfSearch process."
-):
-    response1 = requests.post(
-        f"{api_service_url}/api/web_pdf_search/", json={"argument": argument}
-    )
-    if response1.status_code == 200:
-        st.success("WebPdfSearch completed successfully")
-    else:
-        st.error("WebPdfSearch failed")
-
-# Button for ImportDocuments
-if st.button(
-    "Start ImportDocuments", key="importdocuments_button", help="Click to initiate the ImportDocuments process."
-):
-    response2 = requests.post(
-        f"{api_service_url}/api/import_documents/", json={"location": "global"}
-    )
-    if response2.status_code == 200:
-        st.success("ImportDocuments completed successfully")
-    else:
-        st.error("ImportDocuments failed")
-
-# Button for PdfGenerator
-if st.button(
-    "Start PdfGenerator", key="pdfgenerator_button", help="Click to initiate the PdfGenerator process."
-):
-    response3 = requests.post(
-        f"{api_service_url}/api/pdf_generator/", json={"argument": argument}
-    )
-    if response3.status_code == 200:
-        st.success("PdfGenerator completed successfully")
-        # Update the session state with the new PDF content
-        st.session_state["pdf_base64"] = base64.b64encode(
-            response3.content
-        ).decode()
+show_controls()
+
+# Show each finished job's result once
+for kind, message in st.session_state["notices"]:
+    if kind == "success":
+        st.success(message)
     else:
-        st.error("PdfGenerator failed")
+        st.error(message)
+st.session_state["notices"] = []
+
+if st.session_state["jobs"]:
+    show_job_progress()
 
-# Display the PDF from session state if it exists
-if st.session_state["pdf_base64"]:
+# Display the PDF for the current ingredient
+if pdf_base64 is not None:
     st.subheader("Generated PDF")
     st.markdown(
-        f'<iframe src="data:application/pdf;base64,{st.session_state["pdf_base64"]}" width="100%" height="700" type="application/pdf"></iframe>',
+        f'<iframe src="data:application/pdf;base64,{pdf_base64}" width="100%" height="700" type="application/pdf"></iframe>',
         unsafe_allow_html=True,
     )
 